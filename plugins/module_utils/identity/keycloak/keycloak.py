@@ -7,13 +7,32 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import copy
+import hashlib
 import json
+import os
+import re
+import tempfile
+import threading
+import time
 import traceback
+import zlib
 
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.six.moves.urllib.parse import urlencode, quote
 from ansible.module_utils.six.moves.urllib.error import HTTPError
-from ansible.module_utils.common.text.converters import to_native, to_text
+from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Changes to the resources at these paths may change the IDs of groups and clients, see KeycloakAPI._persistently_cached()
+LOOKUP_CACHE_INVALIDATING_PATH = re.compile(r'/admin/realms(/[^/]+(/(groups|clients)(/[^/]+)?)?)?$')
 
 URL_REALM_INFO = "{url}/realms/{realm}"
 URL_REALMS = "{url}/admin/realms"
@@ -229,6 +248,168 @@ class KeycloakAPI(object):
         self.connection_timeout = self.module.params.get('connection_timeout')
         self.restheaders = connection_header
         self.http_agent = self.module.params.get('http_agent')
+        # Results of name to ID lookups, see _cached()
+        self._cache = {}
+        # Number of seconds lookups are shared with later tasks, see _persistently_cached()
+        self.lookup_cache_ttl = self.module.params.get('lookup_cache_ttl') or 0
+
+    def _cached(self, key, fetch):
+        """ Returns the result of fetch(), calling it only the first time key is used.
+
+        The cache lives as long as this object, that is for one module execution, and it
+        is emptied by every request which is not a GET, as that may change the cached data.
+
+        :param key: hashable key identifying the lookup
+        :param fetch: function without arguments returning the result of the lookup
+        :return: a copy of the (cached) result of fetch()
+        """
+        if key not in self._cache:
+            self._cache[key] = fetch()
+        return copy.deepcopy(self._cache[key])
+
+    def _lookup_cache_path(self):
+        """ Returns the path of the file sharing lookups between tasks running against this Keycloak server.
+
+        The file lives in the remote temporary directory (C(remote_tmp)) of the host running the module.
+        """
+        remote_tmp = os.path.expanduser(os.path.expandvars(self.module._remote_tmp or '~/.ansible/tmp'))
+        digest = hashlib.sha1(to_bytes(self.baseurl)).hexdigest()
+        return os.path.join(remote_tmp, 'keycloak_lookup_cache_%s.json' % digest)
+
+    def _persistently_cached(self, key, fetch):
+        """ Like _cached(), but also shares the result with the tasks run afterwards on the same host
+        for lookup_cache_ttl seconds, by storing it in the file given by _lookup_cache_path().
+
+        Only use this for lookups whose result does not change unless the object is deleted, like IDs.
+        Every change made to a realm, a group or a client removes the file, see _request().
+
+        :param key: tuple of strings identifying the lookup
+        :param fetch: function without arguments returning the result of the lookup
+        :return: the (cached) result of fetch()
+        """
+        if not self.lookup_cache_ttl:
+            return self._cached(key, fetch)
+
+        path = self._lookup_cache_path()
+        entry_key = '/'.join(key)
+        read_state = None
+        try:
+            with open(path) as f:
+                read_state = self._lookup_cache_state(os.fstat(f.fileno()))
+                entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            entries = {}
+        if not isinstance(entries, dict):
+            entries = {}
+
+        now = time.time()
+        # Treat entries not shaped as written below, e.g. left by another version, as missing
+        try:
+            entry = entries[entry_key]
+            if now - entry['time'] < self.lookup_cache_ttl:
+                return entry['value']
+        except (KeyError, TypeError):
+            pass
+
+        value = self._cached(key, fetch)
+        # Another task may have changed or removed the file while the value was fetched, e.g. after deleting
+        # the object looked up; writing back what was read then could bring stale IDs back, so skip storing.
+        try:
+            current_state = self._lookup_cache_state(os.stat(path))
+        except (IOError, OSError):
+            current_state = None
+        if value is not None and current_state == read_state:
+            entries[entry_key] = dict(time=now, value=value)
+            try:
+                # Write to a temporary file first, so concurrent tasks never read a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.rename(tmp_path, path)
+            except (IOError, OSError) as e:
+                self.module.warn('Could not store Keycloak lookups in %s: %s' % (path, to_native(e)))
+        return value
+
+    @staticmethod
+    def _lookup_cache_state(stat_result):
+        """ Identifies a version of the lookup cache file, see _persistently_cached(). """
+        return (stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime)
+
+    def _clear_lookup_cache(self):
+        """ Removes the lookups shared between tasks, see _persistently_cached(). """
+        try:
+            os.remove(self._lookup_cache_path())
+        except (IOError, OSError):
+            pass
+
+    def _request(self, url, method, data=None, headers=None):
+        """ Makes a request to Keycloak and returns the raw response.
+
+        All requests made by this class go through here, so the connection options
+        (headers, certificate validation, timeout and user agent) are set up in one place.
+
+        :param url: request path
+        :param method: HTTP method
+        :param data: (optional) data for request
+        :param headers: (optional) headers to send in addition to the authorization ones
+        :return: raw API response
+        """
+        if method != 'GET':
+            self._cache.clear()
+            if LOOKUP_CACHE_INVALIDATING_PATH.search(url.split('?')[0]):
+                self._clear_lookup_cache()
+        request_headers = self.restheaders
+        if headers:
+            request_headers = dict(self.restheaders, **headers)
+        return open_url(url, method=method, data=data,
+                        http_agent=self.http_agent, headers=request_headers,
+                        timeout=self.connection_timeout,
+                        validate_certs=self.validate_certs)
+
+    def _request_and_deserialize(self, url, method, data=None):
+        """ Makes a request to Keycloak and returns the deserialized JSON response.
+
+        :param url: request path
+        :param method: HTTP method
+        :param data: (optional) data for request
+        :return: deserialized API response
+        """
+        body = self._request(url, method, data, headers={'Accept-Encoding': 'gzip'}).read()
+        # Depending on the version of ansible-core, open_url may or may not have decompressed the body already
+        if body[:2] == GZIP_MAGIC:
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        # orjson decodes the (possibly large) role and client listings much faster, use it when it happens to be installed
+        if HAS_ORJSON:
+            return orjson.loads(body)
+        return json.loads(to_native(body))
+
+    def _request_and_deserialize_concurrently(self, urls):
+        """ Makes GET requests for several URLs in parallel and returns the deserialized responses.
+
+        Each request runs in its own thread, so waiting for the responses overlaps. Errors are
+        re-raised in the calling thread, as self.module.fail_json() must not be called from
+        any other thread.
+
+        :param urls: list of request paths
+        :return: list of deserialized API responses, in the same order as urls
+        """
+        responses = [None] * len(urls)
+        errors = []
+
+        def fetch(index, url):
+            try:
+                responses[index] = self._request_and_deserialize(url, method='GET')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch, args=(index, url)) for index, url in enumerate(urls)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return responses
 
     def get_realm_info_by_id(self, realm='master'):
         """ Obtain realm public info by id
@@ -239,9 +420,7 @@ class KeycloakAPI(object):
         realm_info_url = URL_REALM_INFO.format(url=self.baseurl, realm=realm)
 
         try:
-            return json.loads(to_native(open_url(realm_info_url, method='GET', http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(realm_info_url, method='GET')
 
         except HTTPError as e:
             if e.code == 404:
@@ -265,8 +444,7 @@ class KeycloakAPI(object):
         realm_url = URL_REALM.format(url=self.baseurl, realm=realm)
 
         try:
-            return json.loads(to_native(open_url(realm_url, method='GET', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(realm_url, method='GET')
 
         except HTTPError as e:
             if e.code == 404:
@@ -290,8 +468,7 @@ class KeycloakAPI(object):
         realm_url = URL_REALM.format(url=self.baseurl, realm=realm)
 
         try:
-            return open_url(realm_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(realmrep), validate_certs=self.validate_certs)
+            return self._request(realm_url, method='PUT', data=json.dumps(realmrep))
         except Exception as e:
             self.module.fail_json(msg='Could not update realm %s: %s' % (realm, str(e)),
                                   exception=traceback.format_exc())
@@ -304,8 +481,7 @@ class KeycloakAPI(object):
         realm_url = URL_REALMS.format(url=self.baseurl)
 
         try:
-            return open_url(realm_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(realmrep), validate_certs=self.validate_certs)
+            return self._request(realm_url, method='POST', data=json.dumps(realmrep))
         except Exception as e:
             self.module.fail_json(msg='Could not create realm %s: %s' % (realmrep['id'], str(e)),
                                   exception=traceback.format_exc())
@@ -319,8 +495,7 @@ class KeycloakAPI(object):
         realm_url = URL_REALM.format(url=self.baseurl, realm=realm)
 
         try:
-            return open_url(realm_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(realm_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Could not delete realm %s: %s' % (realm, str(e)),
                                   exception=traceback.format_exc())
@@ -337,9 +512,7 @@ class KeycloakAPI(object):
             clientlist_url += '?clientId=%s' % filter
 
         try:
-            return json.loads(to_native(open_url(clientlist_url, http_agent=self.http_agent, method='GET', headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(clientlist_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of clients for realm %s: %s'
                                       % (realm, str(e)))
@@ -369,9 +542,7 @@ class KeycloakAPI(object):
         client_url = URL_CLIENT.format(url=self.baseurl, realm=realm, id=id)
 
         try:
-            return json.loads(to_native(open_url(client_url, method='GET', http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(client_url, method='GET')
 
         except HTTPError as e:
             if e.code == 404:
@@ -393,11 +564,14 @@ class KeycloakAPI(object):
         :param realm: client template from this realm
         :return: id of client (usually a UUID)
         """
-        result = self.get_client_by_clientid(client_id, realm)
-        if isinstance(result, dict) and 'id' in result:
-            return result['id']
-        else:
-            return None
+        def fetch():
+            result = self.get_client_by_clientid(client_id, realm)
+            if isinstance(result, dict) and 'id' in result:
+                return result['id']
+            else:
+                return None
+
+        return self._persistently_cached(('client_id', realm, client_id), fetch)
 
     def update_client(self, id, clientrep, realm="master"):
         """ Update an existing client
@@ -409,8 +583,7 @@ class KeycloakAPI(object):
         client_url = URL_CLIENT.format(url=self.baseurl, realm=realm, id=id)
 
         try:
-            return open_url(client_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(clientrep), validate_certs=self.validate_certs)
+            return self._request(client_url, method='PUT', data=json.dumps(clientrep))
         except Exception as e:
             self.module.fail_json(msg='Could not update client %s in realm %s: %s'
                                       % (id, realm, str(e)))
@@ -424,8 +597,7 @@ class KeycloakAPI(object):
         client_url = URL_CLIENTS.format(url=self.baseurl, realm=realm)
 
         try:
-            return open_url(client_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(clientrep), validate_certs=self.validate_certs)
+            return self._request(client_url, method='POST', data=json.dumps(clientrep))
         except Exception as e:
             self.module.fail_json(msg='Could not create client %s in realm %s: %s'
                                       % (clientrep['clientId'], realm, str(e)))
@@ -440,8 +612,7 @@ class KeycloakAPI(object):
         client_url = URL_CLIENT.format(url=self.baseurl, realm=realm, id=id)
 
         try:
-            return open_url(client_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(client_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Could not delete client %s in realm %s: %s'
                                       % (id, realm, str(e)))
@@ -455,9 +626,7 @@ class KeycloakAPI(object):
         """
         client_roles_url = URL_CLIENT_ROLES.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return json.loads(to_native(open_url(client_roles_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(client_roles_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch rolemappings for client %s in realm %s: %s"
                                       % (cid, realm, str(e)))
@@ -470,11 +639,9 @@ class KeycloakAPI(object):
         :param realm: Realm from which to obtain the rolemappings.
         :return: The ID of the role, None if not found.
         """
-        rolemappings = self.get_client_roles_by_id(cid, realm=realm)
-        for role in rolemappings:
-            if name == role['name']:
-                return role['id']
-        return None
+        role_ids = self._cached(('client_role_ids', realm, cid),
+                                lambda: dict((role['name'], role['id']) for role in self.get_client_roles_by_id(cid, realm=realm)))
+        return role_ids.get(name)
 
     def get_client_group_rolemapping_by_id(self, gid, cid, rid, realm='master'):
         """ Obtain client representation by id
@@ -487,9 +654,7 @@ class KeycloakAPI(object):
         """
         rolemappings_url = URL_CLIENT_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid, client=cid)
         try:
-            rolemappings = json.loads(to_native(open_url(rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                         timeout=self.connection_timeout,
-                                                         validate_certs=self.validate_certs).read()))
+            rolemappings = self._request_and_deserialize(rolemappings_url, method="GET")
             for role in rolemappings:
                 if rid == role['id']:
                     return role
@@ -508,9 +673,7 @@ class KeycloakAPI(object):
         """
         available_rolemappings_url = URL_CLIENT_GROUP_ROLEMAPPINGS_AVAILABLE.format(url=self.baseurl, realm=realm, id=gid, client=cid)
         try:
-            return json.loads(to_native(open_url(available_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(available_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch available rolemappings for client %s in group %s, realm %s: %s"
                                       % (cid, gid, realm, str(e)))
@@ -525,9 +688,7 @@ class KeycloakAPI(object):
         """
         composite_rolemappings_url = URL_CLIENT_GROUP_ROLEMAPPINGS_COMPOSITE.format(url=self.baseurl, realm=realm, id=gid, client=cid)
         try:
-            return json.loads(to_native(open_url(composite_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(composite_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch available rolemappings for client %s in group %s, realm %s: %s"
                                       % (cid, gid, realm, str(e)))
@@ -541,9 +702,7 @@ class KeycloakAPI(object):
         """
         client_roles_url = URL_ROLES_BY_ID.format(url=self.baseurl, realm=realm, id=rid)
         try:
-            return json.loads(to_native(open_url(client_roles_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(client_roles_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch role for id %s in realm %s: %s"
                                       % (rid, realm, str(e)))
@@ -558,9 +717,7 @@ class KeycloakAPI(object):
         """
         client_roles_url = URL_ROLES_BY_ID_COMPOSITES_CLIENTS.format(url=self.baseurl, realm=realm, id=rid, cid=cid)
         try:
-            return json.loads(to_native(open_url(client_roles_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(client_roles_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch role for id %s and cid %s in realm %s: %s"
                                       % (rid, cid, realm, str(e)))
@@ -575,8 +732,7 @@ class KeycloakAPI(object):
         """
         available_rolemappings_url = URL_ROLES_BY_ID_COMPOSITES.format(url=self.baseurl, realm=realm, id=rid)
         try:
-            open_url(available_rolemappings_url, method="POST", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(roles_rep),
-                     validate_certs=self.validate_certs, timeout=self.connection_timeout)
+            self._request(available_rolemappings_url, method="POST", data=json.dumps(roles_rep))
         except Exception as e:
             self.module.fail_json(msg="Could not assign roles to composite role %s and realm %s: %s"
                                       % (rid, realm, str(e)))
@@ -588,24 +744,22 @@ class KeycloakAPI(object):
         :param cid: ID of the client.
         :param role_rep: Representation of the role to assign.
         :param realm: Realm to add the rolemappings to.
-        :return: None.
+        :return: HTTPResponse object on success
         """
         if cid is None:
             group_realm_rolemappings_url = URL_REALM_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid)
             try:
-                open_url(group_realm_rolemappings_url, method="POST", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                        validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                return self._request(group_realm_rolemappings_url, method="POST", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not add rolemappings to group %s, realm %s: %s"
-                                        % (gid, realm, str(e)))
+                                          % (gid, realm, str(e)))
         else:
             group_client_rolemappings_url = URL_CLIENT_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid, client=cid)
             try:
-                open_url(group_client_rolemappings_url, method="POST", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                        validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                return self._request(group_client_rolemappings_url, method="POST", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not add rolemappings for client %s to group %s, realm %s: %s"
-                                        % (cid, gid, realm, str(e)))
+                                          % (cid, gid, realm, str(e)))
 
     def delete_group_rolemapping(self, gid, cid, role_rep, realm="master"):
         """ Delete the rolemapping of a client in a specified group on the Keycloak server.
@@ -614,24 +768,22 @@ class KeycloakAPI(object):
         :param cid: ID of the client from which to obtain the rolemappings.
         :param role_rep: Representation of the role to assign.
         :param realm: Realm from which to obtain the rolemappings.
-        :return: None.
+        :return: HTTPResponse object on success
         """
         if cid is None:
             group_realm_rolemappings_url = URL_REALM_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid)
             try:
-                open_url(group_realm_rolemappings_url, method="DELETE", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                        validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                return self._request(group_realm_rolemappings_url, method="DELETE", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not delete rolemappings from group %s, realm %s: %s"
-                                        % (gid, realm, str(e)))
+                                          % (gid, realm, str(e)))
         else:
             group_client_rolemappings_url = URL_CLIENT_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid, client=cid)
             try:
-                open_url(group_client_rolemappings_url, method="DELETE", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                        validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                return self._request(group_client_rolemappings_url, method="DELETE", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not delete available rolemappings for client %s to group %s, realm %s: %s"
-                                        % (cid, gid, realm, str(e)))
+                                          % (cid, gid, realm, str(e)))
 
     def get_realm_group_rolemapping_by_id(self, gid, rid, realm='master'):
         """ Obtain role representation by id
@@ -643,9 +795,7 @@ class KeycloakAPI(object):
         """
         rolemappings_url = URL_REALM_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid)
         try:
-            rolemappings = json.loads(to_native(open_url(rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                         timeout=self.connection_timeout,
-                                                         validate_certs=self.validate_certs).read()))
+            rolemappings = self._request_and_deserialize(rolemappings_url, method="GET")
             for role in rolemappings:
                 if rid == role['id']:
                     return role
@@ -663,9 +813,7 @@ class KeycloakAPI(object):
         """
         available_rolemappings_url = URL_REALM_GROUP_ROLEMAPPINGS_AVAILABLE.format(url=self.baseurl, realm=realm, id=gid)
         try:
-            return json.loads(to_native(open_url(available_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(available_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch available rolemappings for group %s of realm %s: %s"
                                       % (gid, realm, str(e)))
@@ -679,13 +827,36 @@ class KeycloakAPI(object):
         """
         composite_rolemappings_url = URL_REALM_GROUP_ROLEMAPPINGS_COMPOSITE.format(url=self.baseurl, realm=realm, id=gid)
         try:
-            return json.loads(to_native(open_url(composite_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(composite_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch effective rolemappings for group %s, realm %s: %s"
                                       % (gid, realm, str(e)))
 
+    def get_group_available_and_composite_rolemappings(self, gid, cid, realm="master"):
+        """ Fetch the available and the composite roles of a client or realm for a specified group at the same time.
+
+        :param gid: ID of the group from which to obtain the rolemappings.
+        :param cid: ID of the client from which to obtain the rolemappings, None for the realm rolemappings.
+        :param realm: Realm from which to obtain the rolemappings.
+        :return: A tuple of the available and the composite rolemappings of specified group of the realm (default "master").
+        """
+        if cid is None:
+            urls = [URL_REALM_GROUP_ROLEMAPPINGS_AVAILABLE.format(url=self.baseurl, realm=realm, id=gid),
+                    URL_REALM_GROUP_ROLEMAPPINGS_COMPOSITE.format(url=self.baseurl, realm=realm, id=gid)]
+        else:
+            urls = [URL_CLIENT_GROUP_ROLEMAPPINGS_AVAILABLE.format(url=self.baseurl, realm=realm, id=gid, client=cid),
+                    URL_CLIENT_GROUP_ROLEMAPPINGS_COMPOSITE.format(url=self.baseurl, realm=realm, id=gid, client=cid)]
+        try:
+            available_rolemappings, composite_rolemappings = self._request_and_deserialize_concurrently(urls)
+            return available_rolemappings, composite_rolemappings
+        except Exception as e:
+            if cid is None:
+                self.module.fail_json(msg="Could not fetch rolemappings for group %s, realm %s: %s"
+                                          % (gid, realm, str(e)))
+            else:
+                self.module.fail_json(msg="Could not fetch rolemappings for client %s in group %s, realm %s: %s"
+                                          % (cid, gid, realm, str(e)))
+
     def get_client_user_rolemapping_by_id(self, uid, cid, rid, realm='master'):
         """ Obtain client representation by id
 
@@ -697,9 +868,7 @@ class KeycloakAPI(object):
         """
         rolemappings_url = URL_CLIENT_USER_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=uid, client=cid)
         try:
-            rolemappings = json.loads(to_native(open_url(rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                         timeout=self.connection_timeout,
-                                                         validate_certs=self.validate_certs).read()))
+            rolemappings = self._request_and_deserialize(rolemappings_url, method="GET")
             for role in rolemappings:
                 if rid == role['id']:
                     return role
@@ -718,9 +887,7 @@ class KeycloakAPI(object):
         """
         available_rolemappings_url = URL_CLIENT_USER_ROLEMAPPINGS_AVAILABLE.format(url=self.baseurl, realm=realm, id=uid, client=cid)
         try:
-            return json.loads(to_native(open_url(available_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(available_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch effective rolemappings for client %s and user %s, realm %s: %s"
                                       % (cid, uid, realm, str(e)))
@@ -735,9 +902,7 @@ class KeycloakAPI(object):
         """
         composite_rolemappings_url = URL_CLIENT_USER_ROLEMAPPINGS_COMPOSITE.format(url=self.baseurl, realm=realm, id=uid, client=cid)
         try:
-            return json.loads(to_native(open_url(composite_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(composite_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch available rolemappings for user %s of realm %s: %s"
                                       % (uid, realm, str(e)))
@@ -752,9 +917,7 @@ class KeycloakAPI(object):
         """
         rolemappings_url = URL_REALM_USER_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=uid)
         try:
-            rolemappings = json.loads(to_native(open_url(rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                         timeout=self.connection_timeout,
-                                                         validate_certs=self.validate_certs).read()))
+            rolemappings = self._request_and_deserialize(rolemappings_url, method="GET")
             for role in rolemappings:
                 if rid == role['id']:
                     return role
@@ -772,9 +935,7 @@ class KeycloakAPI(object):
         """
         available_rolemappings_url = URL_REALM_USER_ROLEMAPPINGS_AVAILABLE.format(url=self.baseurl, realm=realm, id=uid)
         try:
-            return json.loads(to_native(open_url(available_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(available_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch available rolemappings for user %s of realm %s: %s"
                                       % (uid, realm, str(e)))
@@ -788,9 +949,7 @@ class KeycloakAPI(object):
         """
         composite_rolemappings_url = URL_REALM_USER_ROLEMAPPINGS_COMPOSITE.format(url=self.baseurl, realm=realm, id=uid)
         try:
-            return json.loads(to_native(open_url(composite_rolemappings_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(composite_rolemappings_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch effective rolemappings for user %s, realm %s: %s"
                                       % (uid, realm, str(e)))
@@ -805,8 +964,7 @@ class KeycloakAPI(object):
         users_url = URL_USERS.format(url=self.baseurl, realm=realm)
         users_url += '?username=%s&exact=true' % username
         try:
-            return json.loads(to_native(open_url(users_url, method='GET', headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(users_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain the user for realm %s and username %s: %s'
                                       % (realm, username, str(e)))
@@ -825,8 +983,7 @@ class KeycloakAPI(object):
 
         service_account_user_url = URL_CLIENT_SERVICE_ACCOUNT_USER.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return json.loads(to_native(open_url(service_account_user_url, method='GET', headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(service_account_user_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain the service-account-user for realm %s and client_id %s: %s'
                                       % (realm, client_id, str(e)))
@@ -846,16 +1003,14 @@ class KeycloakAPI(object):
         if cid is None:
             user_realm_rolemappings_url = URL_REALM_USER_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=uid)
             try:
-                open_url(user_realm_rolemappings_url, method="POST", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                         validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                self._request(user_realm_rolemappings_url, method="POST", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not map roles to userId %s for realm %s and roles %s: %s"
                                           % (uid, realm, json.dumps(role_rep), str(e)))
         else:
             user_client_rolemappings_url = URL_CLIENT_USER_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=uid, client=cid)
             try:
-                open_url(user_client_rolemappings_url, method="POST", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                         validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                self._request(user_client_rolemappings_url, method="POST", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not map roles to userId %s for client %s, realm %s and roles %s: %s"
                                           % (cid, uid, realm, json.dumps(role_rep), str(e)))
@@ -872,16 +1027,14 @@ class KeycloakAPI(object):
         if cid is None:
             user_realm_rolemappings_url = URL_REALM_USER_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=uid)
             try:
-                open_url(user_realm_rolemappings_url, method="DELETE", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                         validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                self._request(user_realm_rolemappings_url, method="DELETE", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not remove roles %s from userId %s, realm %s: %s"
                                           % (json.dumps(role_rep), uid, realm, str(e)))
         else:
             user_client_rolemappings_url = URL_CLIENT_USER_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=uid, client=cid)
             try:
-                open_url(user_client_rolemappings_url, method="DELETE", http_agent=self.http_agent, headers=self.restheaders, data=json.dumps(role_rep),
-                         validate_certs=self.validate_certs, timeout=self.connection_timeout)
+                self._request(user_client_rolemappings_url, method="DELETE", data=json.dumps(role_rep))
             except Exception as e:
                 self.module.fail_json(msg="Could not remove roles %s for client %s from userId %s, realm %s: %s"
                                           % (json.dumps(role_rep), cid, uid, realm, str(e)))
@@ -895,8 +1048,7 @@ class KeycloakAPI(object):
         url = URL_CLIENTTEMPLATES.format(url=self.baseurl, realm=realm)
 
         try:
-            return json.loads(to_native(open_url(url, method='GET', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of client templates for realm %s: %s'
                                       % (realm, str(e)))
@@ -914,8 +1066,7 @@ class KeycloakAPI(object):
         url = URL_CLIENTTEMPLATE.format(url=self.baseurl, id=id, realm=realm)
 
         try:
-            return json.loads(to_native(open_url(url, method='GET', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain client templates %s for realm %s: %s'
                                       % (id, realm, str(e)))
@@ -960,8 +1111,7 @@ class KeycloakAPI(object):
         url = URL_CLIENTTEMPLATE.format(url=self.baseurl, realm=realm, id=id)
 
         try:
-            return open_url(url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(clienttrep), validate_certs=self.validate_certs)
+            return self._request(url, method='PUT', data=json.dumps(clienttrep))
         except Exception as e:
             self.module.fail_json(msg='Could not update client template %s in realm %s: %s'
                                       % (id, realm, str(e)))
@@ -975,8 +1125,7 @@ class KeycloakAPI(object):
         url = URL_CLIENTTEMPLATES.format(url=self.baseurl, realm=realm)
 
         try:
-            return open_url(url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(clienttrep), validate_certs=self.validate_certs)
+            return self._request(url, method='POST', data=json.dumps(clienttrep))
         except Exception as e:
             self.module.fail_json(msg='Could not create client template %s in realm %s: %s'
                                       % (clienttrep['clientId'], realm, str(e)))
@@ -991,8 +1140,7 @@ class KeycloakAPI(object):
         url = URL_CLIENTTEMPLATE.format(url=self.baseurl, realm=realm, id=id)
 
         try:
-            return open_url(url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Could not delete client template %s in realm %s: %s'
                                       % (id, realm, str(e)))
@@ -1008,9 +1156,7 @@ class KeycloakAPI(object):
         """
         clientscopes_url = URL_CLIENTSCOPES.format(url=self.baseurl, realm=realm)
         try:
-            return json.loads(to_native(open_url(clientscopes_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(clientscopes_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch list of clientscopes in realm %s: %s"
                                       % (realm, str(e)))
@@ -1026,9 +1172,7 @@ class KeycloakAPI(object):
         """
         clientscope_url = URL_CLIENTSCOPE.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return json.loads(to_native(open_url(clientscope_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(clientscope_url, method="GET")
 
         except HTTPError as e:
             if e.code == 404:
@@ -1072,8 +1216,7 @@ class KeycloakAPI(object):
         """
         clientscopes_url = URL_CLIENTSCOPES.format(url=self.baseurl, realm=realm)
         try:
-            return open_url(clientscopes_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(clientscoperep), validate_certs=self.validate_certs)
+            return self._request(clientscopes_url, method='POST', data=json.dumps(clientscoperep))
         except Exception as e:
             self.module.fail_json(msg="Could not create clientscope %s in realm %s: %s"
                                       % (clientscoperep['name'], realm, str(e)))
@@ -1087,8 +1230,7 @@ class KeycloakAPI(object):
         clientscope_url = URL_CLIENTSCOPE.format(url=self.baseurl, realm=realm, id=clientscoperep['id'])
 
         try:
-            return open_url(clientscope_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(clientscoperep), validate_certs=self.validate_certs)
+            return self._request(clientscope_url, method='PUT', data=json.dumps(clientscoperep))
 
         except Exception as e:
             self.module.fail_json(msg='Could not update clientscope %s in realm %s: %s'
@@ -1125,8 +1267,7 @@ class KeycloakAPI(object):
         # should have a good cid by here.
         clientscope_url = URL_CLIENTSCOPE.format(realm=realm, id=cid, url=self.baseurl)
         try:
-            return open_url(clientscope_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(clientscope_url, method='DELETE')
 
         except Exception as e:
             self.module.fail_json(msg="Unable to delete clientscope %s: %s" % (cid, str(e)))
@@ -1143,9 +1284,7 @@ class KeycloakAPI(object):
         """
         protocolmappers_url = URL_CLIENTSCOPE_PROTOCOLMAPPERS.format(id=cid, url=self.baseurl, realm=realm)
         try:
-            return json.loads(to_native(open_url(protocolmappers_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(protocolmappers_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch list of protocolmappers in realm %s: %s"
                                       % (realm, str(e)))
@@ -1163,9 +1302,7 @@ class KeycloakAPI(object):
         """
         protocolmapper_url = URL_CLIENTSCOPE_PROTOCOLMAPPER.format(url=self.baseurl, realm=realm, id=cid, mapper_id=pid)
         try:
-            return json.loads(to_native(open_url(protocolmapper_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(protocolmapper_url, method="GET")
 
         except HTTPError as e:
             if e.code == 404:
@@ -1211,8 +1348,7 @@ class KeycloakAPI(object):
         """
         protocolmappers_url = URL_CLIENTSCOPE_PROTOCOLMAPPERS.format(url=self.baseurl, id=cid, realm=realm)
         try:
-            return open_url(protocolmappers_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(mapper_rep), validate_certs=self.validate_certs)
+            return self._request(protocolmappers_url, method='POST', data=json.dumps(mapper_rep))
         except Exception as e:
             self.module.fail_json(msg="Could not create protocolmapper %s in realm %s: %s"
                                       % (mapper_rep['name'], realm, str(e)))
@@ -1227,26 +1363,26 @@ class KeycloakAPI(object):
         protocolmapper_url = URL_CLIENTSCOPE_PROTOCOLMAPPER.format(url=self.baseurl, realm=realm, id=cid, mapper_id=mapper_rep['id'])
 
         try:
-            return open_url(protocolmapper_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(mapper_rep), validate_certs=self.validate_certs)
+            return self._request(protocolmapper_url, method='PUT', data=json.dumps(mapper_rep))
 
         except Exception as e:
             self.module.fail_json(msg='Could not update protocolmappers for clientscope %s in realm %s: %s'
                                       % (mapper_rep, realm, str(e)))
 
-    def get_groups(self, realm="master"):
+    def get_groups(self, realm="master", search=None):
         """ Fetch the name and ID of all groups on the Keycloak server.
 
         To fetch the full data of the group, make a subsequent call to
         get_group_by_groupid, passing in the ID of the group you wish to return.
 
         :param realm: Return the groups of this realm (default "master").
+        :param search: (optional) only return the groups whose name, or the name of one of their subgroups, contains this string.
         """
         groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
+        if search is not None:
+            groups_url += '?' + urlencode({'search': search})
         try:
-            return json.loads(to_native(open_url(groups_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(groups_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg="Could not fetch list of groups in realm %s: %s"
                                       % (realm, str(e)))
@@ -1262,9 +1398,7 @@ class KeycloakAPI(object):
         """
         groups_url = URL_GROUP.format(url=self.baseurl, realm=realm, groupid=gid)
         try:
-            return json.loads(to_native(open_url(groups_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(groups_url, method="GET")
         except HTTPError as e:
             if e.code == 404:
                 return None
@@ -1275,26 +1409,42 @@ class KeycloakAPI(object):
             self.module.fail_json(msg="Could not fetch group %s in realm %s: %s"
                                       % (gid, realm, str(e)))
 
+    def get_group_id(self, name, realm="master"):
+        """ Obtain the ID of a keycloak group within a realm based on its name.
+
+        The ID is taken from the list of groups returned by a search on the name,
+        so no further query is made. If the group does not exist, None is returned.
+        :param name: Name of the group.
+        :param realm: Realm in which the group resides; default 'master'
+        """
+        def fetch():
+            for group in self.get_groups(realm=realm, search=name):
+                if group['name'] == name:
+                    return group['id']
+
+            return None
+
+        return self._persistently_cached(('group_id', realm, name), fetch)
+
     def get_group_by_name(self, name, realm="master"):
         """ Fetch a keycloak group within a realm based on its name.
 
-        The Keycloak API does not allow filtering of the Groups resource by name.
-        As a result, this method first retrieves the entire list of groups - name and ID -
+        The Keycloak API does not allow filtering of the Groups resource by exact name.
+        As a result, this method first looks up the ID of the group with get_group_id,
         then performs a second query to fetch the group.
 
         If the group does not exist, None is returned.
         :param name: Name of the group to fetch.
         :param realm: Realm in which the group resides; default 'master'
         """
-        groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
-        try:
-            all_groups = self.get_groups(realm=realm)
-
-            for group in all_groups:
-                if group['name'] == name:
-                    return self.get_group_by_groupid(group['id'], realm=realm)
+        def fetch():
+            gid = self.get_group_id(name, realm=realm)
+            if gid is None:
+                return None
+            return self.get_group_by_groupid(gid, realm=realm)
 
-            return None
+        try:
+            return self._cached(('group_by_name', realm, name), fetch)
 
         except Exception as e:
             self.module.fail_json(msg="Could not fetch group %s in realm %s: %s"
@@ -1308,8 +1458,7 @@ class KeycloakAPI(object):
         """
         groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
         try:
-            return open_url(groups_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(grouprep), validate_certs=self.validate_certs)
+            return self._request(groups_url, method='POST', data=json.dumps(grouprep))
         except Exception as e:
             self.module.fail_json(msg="Could not create group %s in realm %s: %s"
                                       % (grouprep['name'], realm, str(e)))
@@ -1323,8 +1472,7 @@ class KeycloakAPI(object):
         group_url = URL_GROUP.format(url=self.baseurl, realm=realm, groupid=grouprep['id'])
 
         try:
-            return open_url(group_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(grouprep), validate_certs=self.validate_certs)
+            return self._request(group_url, method='PUT', data=json.dumps(grouprep))
         except Exception as e:
             self.module.fail_json(msg='Could not update group %s in realm %s: %s'
                                       % (grouprep['name'], realm, str(e)))
@@ -1360,8 +1508,7 @@ class KeycloakAPI(object):
         # should have a good groupid by here.
         group_url = URL_GROUP.format(realm=realm, groupid=groupid, url=self.baseurl)
         try:
-            return open_url(group_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(group_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg="Unable to delete group %s: %s" % (groupid, str(e)))
 
@@ -1373,9 +1520,7 @@ class KeycloakAPI(object):
         """
         rolelist_url = URL_REALM_ROLES.format(url=self.baseurl, realm=realm)
         try:
-            return json.loads(to_native(open_url(rolelist_url, method='GET', http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(rolelist_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of roles for realm %s: %s'
                                       % (realm, str(e)))
@@ -1392,8 +1537,7 @@ class KeycloakAPI(object):
         """
         role_url = URL_REALM_ROLE.format(url=self.baseurl, realm=realm, name=quote(name))
         try:
-            return json.loads(to_native(open_url(role_url, method="GET", http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(role_url, method="GET")
         except HTTPError as e:
             if e.code == 404:
                 return None
@@ -1412,8 +1556,7 @@ class KeycloakAPI(object):
         """
         roles_url = URL_REALM_ROLES.format(url=self.baseurl, realm=realm)
         try:
-            return open_url(roles_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(rolerep), validate_certs=self.validate_certs)
+            return self._request(roles_url, method='POST', data=json.dumps(rolerep))
         except Exception as e:
             self.module.fail_json(msg='Could not create role %s in realm %s: %s'
                                       % (rolerep['name'], realm, str(e)))
@@ -1426,8 +1569,7 @@ class KeycloakAPI(object):
         """
         role_url = URL_REALM_ROLE.format(url=self.baseurl, realm=realm, name=quote(rolerep['name']))
         try:
-            return open_url(role_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(rolerep), validate_certs=self.validate_certs)
+            return self._request(role_url, method='PUT', data=json.dumps(rolerep))
         except Exception as e:
             self.module.fail_json(msg='Could not update role %s in realm %s: %s'
                                       % (rolerep['name'], realm, str(e)))
@@ -1440,8 +1582,7 @@ class KeycloakAPI(object):
         """
         role_url = URL_REALM_ROLE.format(url=self.baseurl, realm=realm, name=quote(name))
         try:
-            return open_url(role_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(role_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Unable to delete role %s in realm %s: %s'
                                       % (name, realm, str(e)))
@@ -1459,9 +1600,7 @@ class KeycloakAPI(object):
                                       % (clientid, realm))
         rolelist_url = URL_CLIENT_ROLES.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return json.loads(to_native(open_url(rolelist_url, method='GET', http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(rolelist_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of roles for client %s in realm %s: %s'
                                       % (clientid, realm, str(e)))
@@ -1484,8 +1623,7 @@ class KeycloakAPI(object):
                                       % (clientid, realm))
         role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(name))
         try:
-            return json.loads(to_native(open_url(role_url, method="GET", http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(role_url, method="GET")
         except HTTPError as e:
             if e.code == 404:
                 return None
@@ -1510,8 +1648,7 @@ class KeycloakAPI(object):
                                       % (clientid, realm))
         roles_url = URL_CLIENT_ROLES.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return open_url(roles_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(rolerep), validate_certs=self.validate_certs)
+            return self._request(roles_url, method='POST', data=json.dumps(rolerep))
         except Exception as e:
             self.module.fail_json(msg='Could not create role %s for client %s in realm %s: %s'
                                       % (rolerep['name'], clientid, realm, str(e)))
@@ -1530,8 +1667,7 @@ class KeycloakAPI(object):
                                       % (clientid, realm))
         role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(rolerep['name']))
         try:
-            return open_url(role_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(rolerep), validate_certs=self.validate_certs)
+            return self._request(role_url, method='PUT', data=json.dumps(rolerep))
         except Exception as e:
             self.module.fail_json(msg='Could not update role %s for client %s in realm %s: %s'
                                       % (rolerep['name'], clientid, realm, str(e)))
@@ -1549,8 +1685,7 @@ class KeycloakAPI(object):
                                       % (clientid, realm))
         role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(name))
         try:
-            return open_url(role_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(role_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Unable to delete role %s for client %s in realm %s: %s'
                                       % (name, clientid, realm, str(e)))
@@ -1565,9 +1700,7 @@ class KeycloakAPI(object):
         try:
             authentication_flow = {}
             # Check if the authentication flow exists on the Keycloak serveraders
-            authentications = json.load(open_url(URL_AUTHENTICATION_FLOWS.format(url=self.baseurl, realm=realm), method='GET',
-                                                 http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout, validate_certs=self.validate_certs))
+            authentications = self._request_and_deserialize(URL_AUTHENTICATION_FLOWS.format(url=self.baseurl, realm=realm), method='GET')
             for authentication in authentications:
                 if authentication["alias"] == alias:
                     authentication_flow = authentication
@@ -1586,8 +1719,7 @@ class KeycloakAPI(object):
         flow_url = URL_AUTHENTICATION_FLOW.format(url=self.baseurl, realm=realm, id=id)
 
         try:
-            return open_url(flow_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(flow_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Could not delete authentication flow %s in realm %s: %s'
                                   % (id, realm, str(e)))
@@ -1603,24 +1735,9 @@ class KeycloakAPI(object):
             new_name = dict(
                 newName=config["alias"]
             )
-            open_url(
-                URL_AUTHENTICATION_FLOW_COPY.format(
-                    url=self.baseurl,
-                    realm=realm,
-                    copyfrom=quote(config["copyFrom"])),
-                method='POST',
-                http_agent=self.http_agent, headers=self.restheaders,
-                data=json.dumps(new_name),
-                timeout=self.connection_timeout,
-                validate_certs=self.validate_certs)
-            flow_list = json.load(
-                open_url(
-                    URL_AUTHENTICATION_FLOWS.format(url=self.baseurl,
-                                                    realm=realm),
-                    method='GET',
-                    http_agent=self.http_agent, headers=self.restheaders,
-                    timeout=self.connection_timeout,
-                    validate_certs=self.validate_certs))
+            self._request(URL_AUTHENTICATION_FLOW_COPY.format(url=self.baseurl, realm=realm, copyfrom=quote(config["copyFrom"])),
+                          method='POST', data=json.dumps(new_name))
+            flow_list = self._request_and_deserialize(URL_AUTHENTICATION_FLOWS.format(url=self.baseurl, realm=realm), method='GET')
             for flow in flow_list:
                 if flow["alias"] == config["alias"]:
                     return flow
@@ -1643,24 +1760,8 @@ class KeycloakAPI(object):
                 description=config["description"],
                 topLevel=True
             )
-            open_url(
-                URL_AUTHENTICATION_FLOWS.format(
-                    url=self.baseurl,
-                    realm=realm),
-                method='POST',
-                http_agent=self.http_agent, headers=self.restheaders,
-                data=json.dumps(new_flow),
-                timeout=self.connection_timeout,
-                validate_certs=self.validate_certs)
-            flow_list = json.load(
-                open_url(
-                    URL_AUTHENTICATION_FLOWS.format(
-                        url=self.baseurl,
-                        realm=realm),
-                    method='GET',
-                    http_agent=self.http_agent, headers=self.restheaders,
-                    timeout=self.connection_timeout,
-                    validate_certs=self.validate_certs))
+            self._request(URL_AUTHENTICATION_FLOWS.format(url=self.baseurl, realm=realm), method='POST', data=json.dumps(new_flow))
+            flow_list = self._request_and_deserialize(URL_AUTHENTICATION_FLOWS.format(url=self.baseurl, realm=realm), method='GET')
             for flow in flow_list:
                 if flow["alias"] == config["alias"]:
                     return flow
@@ -1677,16 +1778,8 @@ class KeycloakAPI(object):
         :return: HTTPResponse object on success
         """
         try:
-            open_url(
-                URL_AUTHENTICATION_FLOW_EXECUTIONS.format(
-                    url=self.baseurl,
-                    realm=realm,
-                    flowalias=quote(flowAlias)),
-                method='PUT',
-                http_agent=self.http_agent, headers=self.restheaders,
-                data=json.dumps(updatedExec),
-                timeout=self.connection_timeout,
-                validate_certs=self.validate_certs)
+            self._request(URL_AUTHENTICATION_FLOW_EXECUTIONS.format(url=self.baseurl, realm=realm, flowalias=quote(flowAlias)),
+                          method='PUT', data=json.dumps(updatedExec))
         except Exception as e:
             self.module.fail_json(msg="Unable to update executions %s: %s" % (updatedExec, str(e)))
 
@@ -1698,16 +1791,8 @@ class KeycloakAPI(object):
         :return: HTTPResponse object on success
         """
         try:
-            open_url(
-                URL_AUTHENTICATION_EXECUTION_CONFIG.format(
-                    url=self.baseurl,
-                    realm=realm,
-                    id=executionId),
-                method='POST',
-                http_agent=self.http_agent, headers=self.restheaders,
-                data=json.dumps(authenticationConfig),
-                timeout=self.connection_timeout,
-                validate_certs=self.validate_certs)
+            self._request(URL_AUTHENTICATION_EXECUTION_CONFIG.format(url=self.baseurl, realm=realm, id=executionId),
+                          method='POST', data=json.dumps(authenticationConfig))
         except Exception as e:
             self.module.fail_json(msg="Unable to add authenticationConfig %s: %s" % (executionId, str(e)))
 
@@ -1723,16 +1808,8 @@ class KeycloakAPI(object):
             newSubFlow["alias"] = subflowName
             newSubFlow["provider"] = "registration-page-form"
             newSubFlow["type"] = "basic-flow"
-            open_url(
-                URL_AUTHENTICATION_FLOW_EXECUTIONS_FLOW.format(
-                    url=self.baseurl,
-                    realm=realm,
-                    flowalias=quote(flowAlias)),
-                method='POST',
-                http_agent=self.http_agent, headers=self.restheaders,
-                data=json.dumps(newSubFlow),
-                timeout=self.connection_timeout,
-                validate_certs=self.validate_certs)
+            self._request(URL_AUTHENTICATION_FLOW_EXECUTIONS_FLOW.format(url=self.baseurl, realm=realm, flowalias=quote(flowAlias)),
+                          method='POST', data=json.dumps(newSubFlow))
         except Exception as e:
             self.module.fail_json(msg="Unable to create new subflow %s: %s" % (subflowName, str(e)))
 
@@ -1747,16 +1824,8 @@ class KeycloakAPI(object):
             newExec = {}
             newExec["provider"] = execution["providerId"]
             newExec["requirement"] = execution["requirement"]
-            open_url(
-                URL_AUTHENTICATION_FLOW_EXECUTIONS_EXECUTION.format(
-                    url=self.baseurl,
-                    realm=realm,
-                    flowalias=quote(flowAlias)),
-                method='POST',
-                http_agent=self.http_agent, headers=self.restheaders,
-                data=json.dumps(newExec),
-                timeout=self.connection_timeout,
-                validate_certs=self.validate_certs)
+            self._request(URL_AUTHENTICATION_FLOW_EXECUTIONS_EXECUTION.format(url=self.baseurl, realm=realm, flowalias=quote(flowAlias)),
+                          method='POST', data=json.dumps(newExec))
         except Exception as e:
             self.module.fail_json(msg="Unable to create new execution %s: %s" % (execution["provider"], str(e)))
 
@@ -1771,26 +1840,10 @@ class KeycloakAPI(object):
         try:
             if diff > 0:
                 for i in range(diff):
-                    open_url(
-                        URL_AUTHENTICATION_EXECUTION_RAISE_PRIORITY.format(
-                            url=self.baseurl,
-                            realm=realm,
-                            id=executionId),
-                        method='POST',
-                        http_agent=self.http_agent, headers=self.restheaders,
-                        timeout=self.connection_timeout,
-                        validate_certs=self.validate_certs)
+                    self._request(URL_AUTHENTICATION_EXECUTION_RAISE_PRIORITY.format(url=self.baseurl, realm=realm, id=executionId), method='POST')
             elif diff < 0:
                 for i in range(-diff):
-                    open_url(
-                        URL_AUTHENTICATION_EXECUTION_LOWER_PRIORITY.format(
-                            url=self.baseurl,
-                            realm=realm,
-                            id=executionId),
-                        method='POST',
-                        http_agent=self.http_agent, headers=self.restheaders,
-                        timeout=self.connection_timeout,
-                        validate_certs=self.validate_certs)
+                    self._request(URL_AUTHENTICATION_EXECUTION_LOWER_PRIORITY.format(url=self.baseurl, realm=realm, id=executionId), method='POST')
         except Exception as e:
             self.module.fail_json(msg="Unable to change execution priority %s: %s" % (executionId, str(e)))
 
@@ -1803,29 +1856,12 @@ class KeycloakAPI(object):
         """
         try:
             # Get executions created
-            executions = json.load(
-                open_url(
-                    URL_AUTHENTICATION_FLOW_EXECUTIONS.format(
-                        url=self.baseurl,
-                        realm=realm,
-                        flowalias=quote(config["alias"])),
-                    method='GET',
-                    http_agent=self.http_agent, headers=self.restheaders,
-                    timeout=self.connection_timeout,
-                    validate_certs=self.validate_certs))
+            executions_url = URL_AUTHENTICATION_FLOW_EXECUTIONS.format(url=self.baseurl, realm=realm, flowalias=quote(config["alias"]))
+            executions = self._request_and_deserialize(executions_url, method='GET')
             for execution in executions:
                 if "authenticationConfig" in execution:
                     execConfigId = execution["authenticationConfig"]
-                    execConfig = json.load(
-                        open_url(
-                            URL_AUTHENTICATION_CONFIG.format(
-                                url=self.baseurl,
-                                realm=realm,
-                                id=execConfigId),
-                            method='GET',
-                            http_agent=self.http_agent, headers=self.restheaders,
-                            timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs))
+                    execConfig = self._request_and_deserialize(URL_AUTHENTICATION_CONFIG.format(url=self.baseurl, realm=realm, id=execConfigId), method='GET')
                     execution["authenticationConfig"] = execConfig
             return executions
         except Exception as e:
@@ -1839,8 +1875,7 @@ class KeycloakAPI(object):
         """
         idps_url = URL_IDENTITY_PROVIDERS.format(url=self.baseurl, realm=realm)
         try:
-            return json.loads(to_native(open_url(idps_url, method='GET', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(idps_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of identity providers for realm %s: %s'
                                       % (realm, str(e)))
@@ -1856,8 +1891,7 @@ class KeycloakAPI(object):
         """
         idp_url = URL_IDENTITY_PROVIDER.format(url=self.baseurl, realm=realm, alias=alias)
         try:
-            return json.loads(to_native(open_url(idp_url, method="GET", http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(idp_url, method="GET")
         except HTTPError as e:
             if e.code == 404:
                 return None
@@ -1876,8 +1910,7 @@ class KeycloakAPI(object):
         """
         idps_url = URL_IDENTITY_PROVIDERS.format(url=self.baseurl, realm=realm)
         try:
-            return open_url(idps_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(idprep), validate_certs=self.validate_certs)
+            return self._request(idps_url, method='POST', data=json.dumps(idprep))
         except Exception as e:
             self.module.fail_json(msg='Could not create identity provider %s in realm %s: %s'
                                       % (idprep['alias'], realm, str(e)))
@@ -1890,8 +1923,7 @@ class KeycloakAPI(object):
         """
         idp_url = URL_IDENTITY_PROVIDER.format(url=self.baseurl, realm=realm, alias=idprep['alias'])
         try:
-            return open_url(idp_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(idprep), validate_certs=self.validate_certs)
+            return self._request(idp_url, method='PUT', data=json.dumps(idprep))
         except Exception as e:
             self.module.fail_json(msg='Could not update identity provider %s in realm %s: %s'
                                       % (idprep['alias'], realm, str(e)))
@@ -1903,8 +1935,7 @@ class KeycloakAPI(object):
         """
         idp_url = URL_IDENTITY_PROVIDER.format(url=self.baseurl, realm=realm, alias=alias)
         try:
-            return open_url(idp_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(idp_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Unable to delete identity provider %s in realm %s: %s'
                                       % (alias, realm, str(e)))
@@ -1917,9 +1948,7 @@ class KeycloakAPI(object):
         """
         mappers_url = URL_IDENTITY_PROVIDER_MAPPERS.format(url=self.baseurl, realm=realm, alias=alias)
         try:
-            return json.loads(to_native(open_url(mappers_url, method='GET', http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(mappers_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of identity provider mappers for idp %s in realm %s: %s'
                                       % (alias, realm, str(e)))
@@ -1936,9 +1965,7 @@ class KeycloakAPI(object):
         """
         mapper_url = URL_IDENTITY_PROVIDER_MAPPER.format(url=self.baseurl, realm=realm, alias=alias, id=mid)
         try:
-            return json.loads(to_native(open_url(mapper_url, method="GET", http_agent=self.http_agent, headers=self.restheaders,
-                                                 timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(mapper_url, method="GET")
         except HTTPError as e:
             if e.code == 404:
                 return None
@@ -1958,8 +1985,7 @@ class KeycloakAPI(object):
         """
         mappers_url = URL_IDENTITY_PROVIDER_MAPPERS.format(url=self.baseurl, realm=realm, alias=alias)
         try:
-            return open_url(mappers_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(mapper), validate_certs=self.validate_certs)
+            return self._request(mappers_url, method='POST', data=json.dumps(mapper))
         except Exception as e:
             self.module.fail_json(msg='Could not create identity provider mapper %s for idp %s in realm %s: %s'
                                       % (mapper['name'], alias, realm, str(e)))
@@ -1973,8 +1999,7 @@ class KeycloakAPI(object):
         """
         mapper_url = URL_IDENTITY_PROVIDER_MAPPER.format(url=self.baseurl, realm=realm, alias=alias, id=mapper['id'])
         try:
-            return open_url(mapper_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(mapper), validate_certs=self.validate_certs)
+            return self._request(mapper_url, method='PUT', data=json.dumps(mapper))
         except Exception as e:
             self.module.fail_json(msg='Could not update mapper %s for identity provider %s in realm %s: %s'
                                       % (mapper['id'], alias, realm, str(e)))
@@ -1987,8 +2012,7 @@ class KeycloakAPI(object):
         """
         mapper_url = URL_IDENTITY_PROVIDER_MAPPER.format(url=self.baseurl, realm=realm, alias=alias, id=mid)
         try:
-            return open_url(mapper_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(mapper_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Unable to delete mapper %s for identity provider %s in realm %s: %s'
                                       % (mid, alias, realm, str(e)))
@@ -2004,8 +2028,7 @@ class KeycloakAPI(object):
             comps_url += '?%s' % filter
 
         try:
-            return json.loads(to_native(open_url(comps_url, method='GET', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(comps_url, method='GET')
         except ValueError as e:
             self.module.fail_json(msg='API returned incorrect JSON when trying to obtain list of components for realm %s: %s'
                                       % (realm, str(e)))
@@ -2021,8 +2044,7 @@ class KeycloakAPI(object):
         """
         comp_url = URL_COMPONENT.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return json.loads(to_native(open_url(comp_url, method="GET", http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(comp_url, method="GET")
         except HTTPError as e:
             if e.code == 404:
                 return None
@@ -2041,14 +2063,12 @@ class KeycloakAPI(object):
         """
         comps_url = URL_COMPONENTS.format(url=self.baseurl, realm=realm)
         try:
-            resp = open_url(comps_url, method='POST', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(comprep), validate_certs=self.validate_certs)
+            resp = self._request(comps_url, method='POST', data=json.dumps(comprep))
             comp_url = resp.getheader('Location')
             if comp_url is None:
                 self.module.fail_json(msg='Could not create component in realm %s: %s'
                                           % (realm, 'unexpected response'))
-            return json.loads(to_native(open_url(comp_url, method="GET", http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                                                 validate_certs=self.validate_certs).read()))
+            return self._request_and_deserialize(comp_url, method="GET")
         except Exception as e:
             self.module.fail_json(msg='Could not create component in realm %s: %s'
                                       % (realm, str(e)))
@@ -2064,8 +2084,7 @@ class KeycloakAPI(object):
             self.module.fail_json(msg='Cannot update component without id')
         comp_url = URL_COMPONENT.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return open_url(comp_url, method='PUT', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            data=json.dumps(comprep), validate_certs=self.validate_certs)
+            return self._request(comp_url, method='PUT', data=json.dumps(comprep))
         except Exception as e:
             self.module.fail_json(msg='Could not update component %s in realm %s: %s'
                                       % (cid, realm, str(e)))
@@ -2077,8 +2096,7 @@ class KeycloakAPI(object):
         """
         comp_url = URL_COMPONENT.format(url=self.baseurl, realm=realm, id=cid)
         try:
-            return open_url(comp_url, method='DELETE', http_agent=self.http_agent, headers=self.restheaders, timeout=self.connection_timeout,
-                            validate_certs=self.validate_certs)
+            return self._request(comp_url, method='DELETE')
         except Exception as e:
             self.module.fail_json(msg='Unable to delete component %s in realm %s: %s'
                                       % (cid, realm, str(e)))
@@ -29,8 +29,8 @@ description:
       be returned that way by this module. You may pass single values for attributes when calling the module,
       and this will be translated into a list suitable for the API.
 
-    - When updating a group_rolemapping, where possible provide the role ID to the module. This removes a lookup
-      to the API to translate the name into the role ID.
+    - Roles may be given by name, by ID or both. Missing names and IDs are looked up in the rolemappings of the
+      group the module fetches anyway, so this does not require additional API calls.
 
 
 options:
@@ -81,6 +81,7 @@ options:
     roles:
         description:
             - Roles to be mapped to the group.
+            - Each role needs at least one of I(name) and I(id).
         type: list
         elements: dict
         suboptions:
@@ -93,8 +94,28 @@ options:
                 type: str
                 description:
                     - The unique identifier for this role_representation.
-                    - This parameter is not required for updating or deleting a role_representation but
-                      providing it will reduce the number of API calls required.
+                    - This parameter is not required for updating or deleting a role_representation;
+                      when it is missing, it is looked up from I(name) in the rolemappings of the group.
+
+    verify_end_state:
+        description:
+            - Fetch the rolemappings of the group from Keycloak again after changing them, and return those as C(end_state).
+            - When C(false) and Keycloak confirms the changes with C(204 No Content), C(end_state) is computed from the
+              existing rolemappings and the changes made, which saves an API call. Roles which only become effective
+              (or stop being effective) through composite roles are then not reflected in C(end_state).
+        type: bool
+        default: false
+
+    lookup_cache_ttl:
+        description:
+            - Number of seconds the IDs looked up for I(target_groupname) and I(client_id) are reused by the
+              tasks run afterwards on the same host, for example by the other iterations of a loop.
+            - The IDs are stored in a file in the remote temporary directory (C(remote_tmp)). Every change made to
+              a realm, a group or a client by a Keycloak module on the same host removes that file, changes made
+              by other means do not. Changing rolemappings keeps it.
+            - C(0) disables sharing the IDs between tasks.
+        type: int
+        default: 0
 
 extends_documentation_fragment:
 - community.general.keycloak
@@ -167,7 +188,7 @@ msg:
     sample: "Role role1 assigned to group group1."
 
 proposed:
-    description: Representation of proposed client role mapping.
+    description: Representation of proposed client role mapping, as given in I(roles).
     returned: always
     type: dict
     sample: {
@@ -190,6 +211,8 @@ existing:
 end_state:
     description:
       - Representation of client role mapping after module execution.
+      - Unless I(verify_end_state=true), this is computed from the existing mappings and the changes made
+        when Keycloak confirms the changes with C(204 No Content).
       - The sample is truncated.
     returned: on success
     type: dict
@@ -201,8 +224,8 @@ end_state:
     }
 '''
 
-from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import KeycloakAPI, camel, \
-    keycloak_argument_spec, get_token, KeycloakError, is_struct_included
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import KeycloakAPI, \
+    keycloak_argument_spec, get_token, KeycloakError
 from ansible.module_utils.basic import AnsibleModule
 
 
@@ -226,7 +249,9 @@ def main():
         target_groupname=dict(type='str'),
         cid=dict(type='str'),
         client_id=dict(type='str'),
-        roles=dict(type='list', elements='dict', options=roles_spec),
+        roles=dict(type='list', elements='dict', options=roles_spec, required_one_of=[['name', 'id']]),
+        verify_end_state=dict(type='bool', default=False),
+        lookup_cache_ttl=dict(type='int', default=0),
     )
 
     argument_spec.update(meta_args)
@@ -239,6 +264,10 @@ def main():
 
     result = dict(changed=False, msg='', diff={}, proposed={}, existing={}, end_state={})
 
+    # Without roles there is nothing to compare, so none of the API calls below are needed
+    if not module.params.get('roles'):
+        module.exit_json(msg="Nothing to do (no roles specified).")
+
     # Obtain access token, initialize API
     try:
         connection_header = get_token(module.params)
@@ -254,6 +283,7 @@ def main():
     gid = module.params.get('gid')
     target_groupname = module.params.get('target_groupname')
     roles = module.params.get('roles')
+    verify_end_state = module.params.get('verify_end_state')
 
     # Check the parameters
     if gid is None and target_groupname is None:
@@ -261,10 +291,8 @@ def main():
 
     # Get the potential missing parameters
     if gid is None:
-        group_rep = kc.get_group_by_name(name=target_groupname, realm=realm)
-        if group_rep is not None:
-            gid = group_rep.get('id')
-        else:
+        gid = kc.get_group_id(name=target_groupname, realm=realm)
+        if gid is None:
             module.fail_json(msg='Could not fetch group for name %s:' % target_groupname)
 
     if cid is None and client_id is not None:
@@ -272,60 +300,63 @@ def main():
         if cid is None:
             module.fail_json(msg='Could not fetch client %s:' % client_id)
 
-    if roles is None:
-        module.exit_json(msg="Nothing to do (no roles specified).")
+    # Get effective role mappings
+    available_roles_before, assigned_roles_before = kc.get_group_available_and_composite_rolemappings(gid=gid, cid=cid, realm=realm)
+
+    # Resolve the missing IDs and names into a separate list, so that the roles are returned as given.
+    # Nothing needs to be looked up when every role was given with both its ID and its name.
+    if all(role['id'] is not None and role['name'] is not None for role in roles):
+        resolved_roles = roles
     else:
-        for role_index, role in enumerate(roles, start=0):
-            if role.get('name') is None and role.get('id') is None:
-                module.fail_json(msg='Either the `name` or `id` has to be specified on each role.')
+        # Between them, the available and the assigned roles hold every role that can be mapped to
+        # the group, so they are enough to look up the ID or the name of each role given only one of them.
+        role_ids = dict((r['name'], r['id']) for r in available_roles_before + assigned_roles_before)
+        role_names = dict((r['id'], r['name']) for r in available_roles_before + assigned_roles_before)
+
+        resolved_roles = []
+        for role in roles:
+            role_id = role['id']
+            role_name = role['name']
             # Fetch missing role_id
-            if role.get('id') is None:
-                if cid is None:
-                    role_id = kc.get_realm_role(name=role.get('name'), realm=realm)['id']
-                else:
-                    role_id = kc.get_client_role_id_by_name(cid=cid, name=role.get('name'), realm=realm)
-                if role_id is not None:
-                    role['id'] = role_id
-                else:
-                    module.fail_json(msg='Could not fetch role %s for client_id %s or realm %s' % (role.get('name'), client_id, realm))
+            if role_id is None:
+                role_id = role_ids.get(role_name)
+                if role_id is None:
+                    module.fail_json(msg='Could not fetch role %s for client_id %s or realm %s' % (role_name, client_id, realm))
             # Fetch missing role_name
-            else:
-                if cid is None:
-                    role['name'] = kc.get_realm_group_rolemapping_by_id(gid=gid, rid=role.get('id'), realm=realm)['name']
-                else:
-                    role['name'] = kc.get_client_group_rolemapping_by_id(gid=gid, cid=cid, rid=role.get('id'), realm=realm)['name']
-                if role.get('name') is None:
-                    module.fail_json(msg='Could not fetch role %s for client_id %s or realm %s' % (role.get('id'), client_id, realm))
-
-    # Get effective role mappings
-    if cid is None:
-        available_roles_before = kc.get_realm_group_available_rolemappings(gid=gid, realm=realm)
-        assigned_roles_before = kc.get_realm_group_composite_rolemappings(gid=gid, realm=realm)
-    else:
-        available_roles_before = kc.get_client_group_available_rolemappings(gid=gid, cid=cid, realm=realm)
-        assigned_roles_before = kc.get_client_group_composite_rolemappings(gid=gid, cid=cid, realm=realm)
+            elif role_name is None:
+                role_name = role_names.get(role_id)
+                if role_name is None:
+                    module.fail_json(msg='Could not fetch role %s for client_id %s or realm %s' % (role_id, client_id, realm))
+            resolved_roles.append({'id': role_id, 'name': role_name})
 
     result['existing'] = assigned_roles_before
     result['proposed'] = roles
 
+    # Compare the roles on their IDs, which is what Keycloak maps them by; the representations are looked up by ID afterwards
+    role_reps = dict((r['id'], r) for r in available_roles_before + assigned_roles_before)
+    for role in resolved_roles:
+        role_rep = role_reps.get(role['id'])
+        if role_rep is None or role_rep['name'] != role['name']:
+            module.fail_json(msg='Could not fetch role %s with ID %s for client_id %s or realm %s' % (role['name'], role['id'], client_id, realm))
+    assigned_role_ids = set(r['id'] for r in assigned_roles_before)
+    requested_role_ids = set(role['id'] for role in resolved_roles)
+
+    # Fetch roles to assign if state present, roles to remove if state absent
+    if state == 'present':
+        available_role_ids = set(r['id'] for r in available_roles_before)
+        update_role_ids = (requested_role_ids & available_role_ids) - assigned_role_ids
+    else:
+        update_role_ids = requested_role_ids & assigned_role_ids
+
+    # Keep the order in which the roles were given, without duplicates
     update_roles = []
-    for role_index, role in enumerate(roles, start=0):
-        # Fetch roles to assign if state present
-        if state == 'present':
-            for available_role in available_roles_before:
-                if role.get('name') == available_role.get('name'):
-                    update_roles.append({
-                        'id': role.get('id'),
-                        'name': role.get('name'),
-                    })
-        # Fetch roles to remove if state absent
-        else:
-            for assigned_role in assigned_roles_before:
-                if role.get('name') == assigned_role.get('name'):
-                    update_roles.append({
-                        'id': role.get('id'),
-                        'name': role.get('name'),
-                    })
+    for role in resolved_roles:
+        if role['id'] in update_role_ids:
+            update_role_ids.discard(role['id'])
+            update_roles.append({
+                'id': role['id'],
+                'name': role['name'],
+            })
 
     if len(update_roles):
         if state == 'present':
@@ -335,9 +366,12 @@ def main():
                 result['diff'] = dict(before=assigned_roles_before, after=update_roles)
             if module.check_mode:
                 module.exit_json(**result)
-            kc.add_group_rolemapping(gid=gid, cid=cid, role_rep=update_roles, realm=realm)
+            response = kc.add_group_rolemapping(gid=gid, cid=cid, role_rep=update_roles, realm=realm)
             result['msg'] = 'Roles %s assigned to groupId %s.' % (update_roles, gid)
-            if cid is None:
+            # Keycloak answers 204 No Content once the roles are mapped; trust that rather than fetching the mappings again
+            if not verify_end_state and response.getcode() == 204:
+                assigned_roles_after = assigned_roles_before + [role_reps[role['id']] for role in update_roles]
+            elif cid is None:
                 assigned_roles_after = kc.get_realm_group_composite_rolemappings(gid=gid, realm=realm)
             else:
                 assigned_roles_after = kc.get_client_group_composite_rolemappings(gid=gid, cid=cid, realm=realm)
@@ -350,9 +384,13 @@ def main():
                 result['diff'] = dict(before=assigned_roles_before, after=update_roles)
             if module.check_mode:
                 module.exit_json(**result)
-            kc.delete_group_rolemapping(uid=gid, cid=cid, role_rep=update_roles, realm=realm)
+            response = kc.delete_group_rolemapping(gid=gid, cid=cid, role_rep=update_roles, realm=realm)
             result['msg'] = 'Roles %s removed from groupId %s.' % (update_roles, gid)
-            if cid is None:
+            # Keycloak answers 204 No Content once the roles are unmapped; trust that rather than fetching the mappings again
+            if not verify_end_state and response.getcode() == 204:
+                removed_role_ids = set(role['id'] for role in update_roles)
+                assigned_roles_after = [role for role in assigned_roles_before if role['id'] not in removed_role_ids]
+            elif cid is None:
                 assigned_roles_after = kc.get_realm_group_composite_rolemappings(gid=gid, realm=realm)
             else:
                 assigned_roles_after = kc.get_client_group_composite_rolemappings(gid=gid, cid=cid, realm=realm)
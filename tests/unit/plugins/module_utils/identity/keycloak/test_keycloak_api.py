@@ -0,0 +1,255 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import zlib
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import KeycloakAPI
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock
+from ansible.module_utils.six import BytesIO
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+
+module_params = {
+    'auth_keycloak_url': 'http://keycloak.url/auth',
+    'validate_certs': True,
+    'connection_timeout': 10,
+    'http_agent': 'Ansible',
+}
+
+connection_header = {
+    'Authorization': 'Bearer alongtoken',
+    'Content-Type': 'application/json'
+}
+
+ROLE1 = {'id': 'c2bf2edb-da94-4f2f-b9f2-196dfee3fe4d', 'name': 'role1'}
+ROLE2 = {'id': '00a2d9a9-924e-49fa-8cde-c539c010ef6e', 'name': 'role2'}
+
+
+class FailJson(Exception):
+    pass
+
+
+def build_mocked_request(response_dict):
+    def _mocked_requests(url, **kwargs):
+        response = response_dict[url]
+        if isinstance(response, Exception):
+            raise response
+        return BytesIO(json.dumps(response).encode('utf-8'))
+    return _mocked_requests
+
+
+def create_keycloak_api(remote_tmp, **params):
+    module = MagicMock()
+    module.params = dict(module_params, **params)
+    module.fail_json.side_effect = FailJson
+    module._remote_tmp = remote_tmp
+    return KeycloakAPI(module, connection_header)
+
+
+@pytest.fixture()
+def keycloak_api(tmp_path):
+    return create_keycloak_api(str(tmp_path))
+
+
+def mock_open_url(mocker, response_dict):
+    return mocker.patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        side_effect=build_mocked_request(response_dict),
+        autospec=True
+    )
+
+
+def test_get_group_available_and_composite_rolemappings(mocker, keycloak_api):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/groups/gid/role-mappings/clients/cid/available': [ROLE1],
+        'http://keycloak.url/auth/admin/realms/master/groups/gid/role-mappings/clients/cid/composite': [ROLE2],
+    })
+
+    available, composite = keycloak_api.get_group_available_and_composite_rolemappings('gid', 'cid', realm='master')
+
+    assert available == [ROLE1]
+    assert composite == [ROLE2]
+    assert mock.call_count == 2
+
+
+@pytest.mark.parametrize('has_orjson', [True, False])
+def test_request_and_deserialize(mocker, keycloak_api, has_orjson):
+    if has_orjson:
+        pytest.importorskip('orjson')
+    mocker.patch('ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.HAS_ORJSON', has_orjson)
+    mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/roles': [ROLE1, ROLE2],
+    })
+
+    assert keycloak_api._request_and_deserialize('http://keycloak.url/auth/admin/realms/master/roles', method='GET') == [ROLE1, ROLE2]
+
+
+def test_request_and_deserialize_gzip(mocker, keycloak_api):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    body = compressor.compress(json.dumps([ROLE1, ROLE2]).encode('utf-8')) + compressor.flush()
+    mock = mocker.patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        return_value=BytesIO(body),
+    )
+
+    assert keycloak_api._request_and_deserialize('http://keycloak.url/auth/admin/realms/master/roles', method='GET') == [ROLE1, ROLE2]
+    assert mock.call_args[1]['headers'] == dict(connection_header, **{'Accept-Encoding': 'gzip'})
+
+
+def test_get_group_available_and_composite_rolemappings_error(mocker, keycloak_api):
+    composite_url = 'http://keycloak.url/auth/admin/realms/master/groups/gid/role-mappings/realm/composite'
+    mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/groups/gid/role-mappings/realm/available': [ROLE1],
+        composite_url: HTTPError(composite_url, 403, 'Forbidden', {}, None),
+    })
+
+    with pytest.raises(FailJson):
+        keycloak_api.get_group_available_and_composite_rolemappings('gid', None, realm='master')
+
+    assert 'Could not fetch rolemappings for group gid, realm master' in keycloak_api.module.fail_json.call_args[1]['msg']
+
+
+def test_get_group_by_name_searches_groups(mocker, keycloak_api):
+    group = {'id': 'gid', 'name': 'group 1', 'path': '/group 1', 'subGroups': []}
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/groups?search=group+1': [
+            {'id': 'other', 'name': 'parent', 'path': '/parent', 'subGroups': [{'id': 'sub', 'name': 'group 1'}]},
+            {'id': 'gid', 'name': 'group 1', 'path': '/group 1'},
+        ],
+        'http://keycloak.url/auth/admin/realms/master/groups/gid': group,
+    })
+
+    assert keycloak_api.get_group_by_name('group 1', realm='master') == group
+    assert mock.call_count == 2
+
+
+def test_get_group_id_does_not_fetch_group(mocker, keycloak_api):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/groups?search=group1': [{'id': 'gid', 'name': 'group1', 'path': '/group1'}],
+    })
+
+    assert keycloak_api.get_group_id('group1', realm='master') == 'gid'
+    assert keycloak_api.get_group_id('group1', realm='master') == 'gid'
+    assert mock.call_count == 1
+
+
+def test_get_client_id_is_cached(mocker, keycloak_api):
+    clients_url = 'http://keycloak.url/auth/admin/realms/master/clients?clientId=client1'
+    mock = mock_open_url(mocker, {
+        clients_url: [{'id': 'cid', 'clientId': 'client1'}],
+        'http://keycloak.url/auth/admin/realms/master/clients': None,
+    })
+
+    assert keycloak_api.get_client_id('client1', realm='master') == 'cid'
+    assert keycloak_api.get_client_id('client1', realm='master') == 'cid'
+    assert mock.call_count == 1
+
+    # Any change made on the server invalidates the cache
+    keycloak_api.create_client({'clientId': 'client2'}, realm='master')
+    assert keycloak_api.get_client_id('client1', realm='master') == 'cid'
+    assert mock.call_count == 3
+
+
+def test_get_client_role_id_by_name_is_cached(mocker, keycloak_api):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/clients/cid/roles': [ROLE1, ROLE2],
+    })
+
+    assert keycloak_api.get_client_role_id_by_name('cid', 'role1', realm='master') == ROLE1['id']
+    assert keycloak_api.get_client_role_id_by_name('cid', 'role2', realm='master') == ROLE2['id']
+    assert keycloak_api.get_client_role_id_by_name('cid', 'unknown', realm='master') is None
+    assert mock.call_count == 1
+
+
+def test_get_client_id_is_shared_between_tasks(mocker, tmp_path):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/clients?clientId=client1': [{'id': 'cid', 'clientId': 'client1'}],
+        'http://keycloak.url/auth/admin/realms/master/clients': None,
+    })
+
+    first_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    assert first_task.get_client_id('client1', realm='master') == 'cid'
+    second_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    assert second_task.get_client_id('client1', realm='master') == 'cid'
+    assert mock.call_count == 1
+
+    # Any change made on the server, even by a task not using the cache, invalidates it
+    create_keycloak_api(str(tmp_path)).create_client({'clientId': 'client2'}, realm='master')
+    third_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    assert third_task.get_client_id('client1', realm='master') == 'cid'
+    assert mock.call_count == 3
+
+
+def test_get_client_id_kept_when_rolemappings_change(mocker, tmp_path):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/clients?clientId=client1': [{'id': 'cid', 'clientId': 'client1'}],
+        'http://keycloak.url/auth/admin/realms/master/groups/gid/role-mappings/clients/cid': None,
+    })
+
+    first_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    first_task.get_client_id('client1', realm='master')
+    first_task.add_group_rolemapping('gid', 'cid', [ROLE1], realm='master')
+    second_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    assert second_task.get_client_id('client1', realm='master') == 'cid'
+
+    assert mock.call_count == 2
+
+
+def test_get_client_id_not_stored_when_cache_removed_meanwhile(mocker, tmp_path):
+    first_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/clients?clientId=client1': [{'id': 'cid1', 'clientId': 'client1'}],
+    })
+    first_task.get_client_id('client1', realm='master')
+    cache_path = first_task._lookup_cache_path()
+
+    # Another task changes the server, and so removes the cache, while this one looks client2 up
+    def remove_cache(url, **kwargs):
+        create_keycloak_api(str(tmp_path))._clear_lookup_cache()
+        return BytesIO(json.dumps([{'id': 'cid2', 'clientId': 'client2'}]).encode('utf-8'))
+
+    mocker.patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        side_effect=remove_cache,
+    )
+    second_task = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    assert second_task.get_client_id('client2', realm='master') == 'cid2'
+
+    assert not os.path.exists(cache_path)
+
+
+@pytest.mark.parametrize('cache', [
+    [],
+    {'client_id/master/client1': 'cid1'},
+    {'client_id/master/client1': {'value': 'cid1'}},
+    {'client_id/master/client1': {'time': 'now', 'value': 'cid1'}},
+])
+def test_get_client_id_malformed_cache(mocker, tmp_path, cache):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/clients?clientId=client1': [{'id': 'cid', 'clientId': 'client1'}],
+    })
+    keycloak_api = create_keycloak_api(str(tmp_path), lookup_cache_ttl=60)
+    with open(keycloak_api._lookup_cache_path(), 'w') as f:
+        json.dump(cache, f)
+
+    assert keycloak_api.get_client_id('client1', realm='master') == 'cid'
+    assert mock.call_count == 1
+
+
+def test_get_client_id_not_shared_by_default(mocker, tmp_path):
+    mock = mock_open_url(mocker, {
+        'http://keycloak.url/auth/admin/realms/master/clients?clientId=client1': [{'id': 'cid', 'clientId': 'client1'}],
+    })
+
+    create_keycloak_api(str(tmp_path)).get_client_id('client1', realm='master')
+    create_keycloak_api(str(tmp_path)).get_client_id('client1', realm='master')
+
+    assert mock.call_count == 2
+    assert list(tmp_path.iterdir()) == []
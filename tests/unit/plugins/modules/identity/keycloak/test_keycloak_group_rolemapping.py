@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from contextlib import contextmanager
+
+from ansible_collections.community.general.tests.unit.compat.mock import DEFAULT, MagicMock, patch
+from ansible_collections.community.general.tests.unit.plugins.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args
+
+from ansible_collections.community.general.plugins.modules.identity.keycloak import keycloak_group_rolemapping
+
+from itertools import count
+
+from ansible.module_utils.six import StringIO
+
+
+PATCHED_METHODS = [
+    'get_group_by_name',
+    'get_group_id',
+    'get_client_id',
+    'get_group_available_and_composite_rolemappings',
+    'get_realm_group_composite_rolemappings',
+    'get_client_group_composite_rolemappings',
+    'add_group_rolemapping',
+    'delete_group_rolemapping',
+]
+
+
+@contextmanager
+def patch_keycloak_api(**responses):
+    """Mock context manager for patching the methods of KeycloakAPI that contact the Keycloak server
+
+    Every method listed in PATCHED_METHODS is replaced by a mock; the keyword arguments give the
+    side effect of the mock of the same name. Unless told otherwise, the mocks of the methods
+    changing rolemappings answer with 204 No Content, like Keycloak does.
+
+    Yields a dict of the mocks, indexed by method name.
+
+    Example::
+
+        with patch_keycloak_api(get_client_id='cid') as mocks:
+            ...
+    """
+    obj = keycloak_group_rolemapping.KeycloakAPI
+    with patch.multiple(obj, **dict((method, DEFAULT) for method in PATCHED_METHODS)) as mocks:
+        mocks['add_group_rolemapping'].return_value = http_response(204)
+        mocks['delete_group_rolemapping'].return_value = http_response(204)
+        for method, response in responses.items():
+            mocks[method].side_effect = response
+        yield mocks
+
+
+def http_response(code):
+    response = MagicMock()
+    response.getcode.return_value = code
+    return response
+
+
+def get_response(object_with_future_response, method, get_id_call_count):
+    if callable(object_with_future_response):
+        return object_with_future_response()
+    if isinstance(object_with_future_response, dict):
+        return get_response(
+            object_with_future_response[method], method, get_id_call_count)
+    if isinstance(object_with_future_response, list):
+        call_number = next(get_id_call_count)
+        return get_response(
+            object_with_future_response[call_number], method, get_id_call_count)
+    return object_with_future_response
+
+
+def build_mocked_request(get_id_user_count, response_dict):
+    def _mocked_requests(*args, **kwargs):
+        url = args[0]
+        method = kwargs['method']
+        future_response = response_dict.get(url, None)
+        return get_response(future_response, method, get_id_user_count)
+    return _mocked_requests
+
+
+def create_wrapper(text_as_string):
+    """Allow to mock many times a call to one address.
+    Without this function, the StringIO is empty for the second call.
+    """
+    def _create_wrapper():
+        return StringIO(text_as_string)
+    return _create_wrapper
+
+
+def mock_good_connection():
+    token_response = {
+        'http://keycloak.url/auth/realms/master/protocol/openid-connect/token': create_wrapper('{"access_token": "alongtoken"}'), }
+    return patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        side_effect=build_mocked_request(count(), token_response),
+        autospec=True
+    )
+
+
+GROUP = {
+    "id": "92f2400e-0ecb-4185-8950-12dcef616c2b",
+    "name": "test_group",
+    "path": "/test_group",
+}
+CLIENT_UUID = "c0f8490c-b224-4737-a567-20223e4c1727"
+ROLE1 = {
+    "clientRole": True,
+    "composite": False,
+    "containerId": CLIENT_UUID,
+    "id": "00a2d9a9-924e-49fa-8cde-c539c010ef6e",
+    "name": "test_role1",
+}
+ROLE2 = {
+    "clientRole": True,
+    "composite": False,
+    "containerId": CLIENT_UUID,
+    "id": "c2bf2edb-da94-4f2f-b9f2-196dfee3fe4d",
+    "name": "test_role2",
+}
+
+
+class TestKeycloakGroupRolemapping(ModuleTestCase):
+    def setUp(self):
+        super(TestKeycloakGroupRolemapping, self).setUp()
+        self.module = keycloak_group_rolemapping
+
+    def _run_module(self, module_args, expected_exception=AnsibleExitJson, **responses):
+        args = {
+            'auth_keycloak_url': 'http://keycloak.url/auth',
+            'auth_password': 'admin',
+            'auth_realm': 'master',
+            'auth_username': 'admin',
+            'auth_client_id': 'admin-cli',
+            'realm': 'realm-name',
+        }
+        args.update(module_args)
+        set_module_args(args)
+
+        with mock_good_connection():
+            with patch_keycloak_api(**responses) as mocks:
+                with self.assertRaises(expected_exception) as exec_info:
+                    self.module.main()
+
+        return exec_info.exception.args[0], mocks
+
+    def test_map_clientrole_to_group_with_name(self):
+        """Map two client roles given by name, taking their IDs from the available roles"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'client_id': 'test_client',
+                'target_groupname': 'test_group',
+                'roles': [{'name': 'test_role1'}, {'name': 'test_role2'}],
+            },
+            get_group_id=[GROUP['id']],
+            get_client_id=[CLIENT_UUID],
+            get_group_available_and_composite_rolemappings=[([ROLE1, ROLE2], [])],
+        )
+
+        self.assertEqual(mocks['get_group_id'].call_count, 1)
+        self.assertEqual(mocks['get_group_by_name'].call_count, 0)
+        self.assertEqual(mocks['get_client_id'].call_count, 1)
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 1)
+        self.assertEqual(mocks['add_group_rolemapping'].call_args[1]['role_rep'], [
+            {'id': ROLE1['id'], 'name': ROLE1['name']},
+            {'id': ROLE2['id'], 'name': ROLE2['name']},
+        ])
+        self.assertEqual(mocks['delete_group_rolemapping'].call_count, 0)
+        self.assertEqual(mocks['get_client_group_composite_rolemappings'].call_count, 0)
+        self.assertEqual(result['end_state'], [ROLE1, ROLE2])
+        self.assertIs(result['changed'], True)
+
+    def test_map_clientrole_to_group_verify_end_state(self):
+        """Fetch the rolemappings again after mapping a client role when verify_end_state is set"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'cid': CLIENT_UUID,
+                'gid': GROUP['id'],
+                'roles': [{'name': 'test_role1'}],
+                'verify_end_state': True,
+            },
+            get_group_available_and_composite_rolemappings=[([ROLE1], [ROLE2])],
+            get_client_group_composite_rolemappings=[[ROLE1, ROLE2]],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 1)
+        self.assertEqual(mocks['get_client_group_composite_rolemappings'].call_count, 1)
+        self.assertEqual(result['end_state'], [ROLE1, ROLE2])
+        self.assertIs(result['changed'], True)
+
+    def test_map_clientrole_to_group_unexpected_response(self):
+        """Fetch the rolemappings again after mapping a client role when Keycloak does not answer 204 No Content"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'cid': CLIENT_UUID,
+                'gid': GROUP['id'],
+                'roles': [{'name': 'test_role1'}],
+            },
+            get_group_available_and_composite_rolemappings=[([ROLE1], [ROLE2])],
+            get_client_group_composite_rolemappings=[[ROLE1, ROLE2]],
+            add_group_rolemapping=[http_response(200)],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 1)
+        self.assertEqual(mocks['get_client_group_composite_rolemappings'].call_count, 1)
+        self.assertEqual(result['end_state'], [ROLE1, ROLE2])
+        self.assertIs(result['changed'], True)
+
+    def test_map_clientrole_to_group_idempotency(self):
+        """Mapping already assigned client roles does not change anything"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'cid': CLIENT_UUID,
+                'gid': GROUP['id'],
+                'roles': [
+                    {'id': ROLE1['id'], 'name': ROLE1['name']},
+                    {'id': ROLE2['id'], 'name': ROLE2['name']},
+                ],
+            },
+            get_group_available_and_composite_rolemappings=[([], [ROLE1, ROLE2])],
+        )
+
+        self.assertEqual(mocks['get_group_id'].call_count, 0)
+        self.assertEqual(mocks['get_client_id'].call_count, 0)
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 0)
+        self.assertEqual(mocks['delete_group_rolemapping'].call_count, 0)
+        self.assertIs(result['changed'], False)
+
+    def test_map_clientrole_to_group_partially_assigned(self):
+        """Only the client roles not assigned yet are mapped, once each"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'cid': CLIENT_UUID,
+                'gid': GROUP['id'],
+                'roles': [{'name': 'test_role2'}, {'name': 'test_role1'}, {'name': 'test_role2'}],
+            },
+            get_group_available_and_composite_rolemappings=[([ROLE2], [ROLE1])],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 1)
+        self.assertEqual(mocks['add_group_rolemapping'].call_args[1]['role_rep'], [{'id': ROLE2['id'], 'name': ROLE2['name']}])
+        self.assertEqual(result['end_state'], [ROLE1, ROLE2])
+        self.assertIs(result['changed'], True)
+
+    def test_no_roles(self):
+        """Without roles the module exits before making any API call"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'client_id': 'test_client',
+                'target_groupname': 'test_group',
+                'roles': [],
+            },
+        )
+
+        for method in PATCHED_METHODS:
+            self.assertEqual(mocks[method].call_count, 0)
+        self.assertIs(result['changed'], False)
+
+    def test_role_without_name_or_id(self):
+        """A role given neither by name nor by ID is rejected before any API call"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'gid': GROUP['id'],
+                'roles': [{'name': 'test_role1'}, {}],
+            },
+            expected_exception=AnsibleFailJson,
+        )
+
+        for method in PATCHED_METHODS:
+            self.assertEqual(mocks[method].call_count, 0)
+        self.assertIn('name, id', result['msg'])
+
+    def test_map_realmrole_to_group_with_id(self):
+        """Map a realm role given by ID, taking its name from the available roles"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'gid': GROUP['id'],
+                'roles': [{'id': ROLE1['id']}],
+            },
+            get_group_available_and_composite_rolemappings=[([ROLE1], [ROLE2])],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 1)
+        self.assertEqual(mocks['add_group_rolemapping'].call_args[1]['role_rep'], [{'id': ROLE1['id'], 'name': ROLE1['name']}])
+        self.assertEqual(result['proposed'], [{'id': ROLE1['id'], 'name': None}])
+        self.assertIs(result['changed'], True)
+
+    def test_remove_realmrole_from_group_with_id(self):
+        """Unmap two realm roles given by ID, taking their names from the assigned roles"""
+        result, mocks = self._run_module(
+            {
+                'state': 'absent',
+                'gid': GROUP['id'],
+                'roles': [{'id': ROLE1['id']}, {'id': ROLE2['id']}],
+            },
+            get_group_available_and_composite_rolemappings=[([], [ROLE1, ROLE2])],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 0)
+        self.assertEqual(mocks['delete_group_rolemapping'].call_count, 1)
+        self.assertEqual(mocks['delete_group_rolemapping'].call_args[1]['gid'], GROUP['id'])
+        self.assertEqual(mocks['get_realm_group_composite_rolemappings'].call_count, 0)
+        self.assertEqual(result['end_state'], [])
+        self.assertIs(result['changed'], True)
+
+    def test_map_unknown_realmrole_to_group(self):
+        """Mapping a realm role that does not exist fails without any further API call"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'gid': GROUP['id'],
+                'roles': [{'name': 'unknown'}],
+            },
+            expected_exception=AnsibleFailJson,
+            get_group_available_and_composite_rolemappings=[([ROLE1, ROLE2], [])],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 0)
+        self.assertIn('Could not fetch role unknown', result['msg'])
+
+    def test_map_clientrole_to_group_with_stale_id(self):
+        """Mapping a client role whose given ID does not match its name fails instead of doing nothing"""
+        result, mocks = self._run_module(
+            {
+                'state': 'present',
+                'cid': CLIENT_UUID,
+                'gid': GROUP['id'],
+                'roles': [{'name': 'test_role1', 'id': 'stale-id'}],
+            },
+            expected_exception=AnsibleFailJson,
+            get_group_available_and_composite_rolemappings=[([ROLE1], [])],
+        )
+
+        self.assertEqual(mocks['add_group_rolemapping'].call_count, 0)
+        self.assertIn('Could not fetch role test_role1 with ID stale-id', result['msg'])
+
+    def test_remove_clientrole_from_group_with_mismatched_name(self):
+        """Unmapping a client role whose given name does not match its ID fails"""
+        result, mocks = self._run_module(
+            {
+                'state': 'absent',
+                'cid': CLIENT_UUID,
+                'gid': GROUP['id'],
+                'roles': [{'name': 'test_role1', 'id': ROLE2['id']}],
+            },
+            expected_exception=AnsibleFailJson,
+            get_group_available_and_composite_rolemappings=[([], [ROLE1, ROLE2])],
+        )
+
+        self.assertEqual(mocks['delete_group_rolemapping'].call_count, 0)
+        self.assertIn('Could not fetch role test_role1 with ID %s' % ROLE2['id'], result['msg'])